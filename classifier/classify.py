@@ -3,10 +3,11 @@ Main classification logic.
 
 Applies all rules in priority order to classify transactions.
 """
+import math
 from datetime import datetime
-from typing import Dict, List
-from .rules import should_ignore, get_hard_override
-from .food_detector import is_food_type_merchant
+from typing import Dict, List, Tuple
+from .rules import classify_by_patterns, IGNORE, OVERRIDE, FOOD
+from .food_detector import is_meal_sized
 
 
 # Valid categories
@@ -21,13 +22,19 @@ CATEGORIES = [
     'other',
 ]
 
+# Category name -> index into CATEGORIES
+CATEGORY_IDS = {name: i for i, name in enumerate(CATEGORIES)}
 
-def classify_transaction(merchant_description: str, transaction_date: datetime, amount: float) -> str:
+# Category ID returned for ignored transactions
+SKIPPED = -1
+
+
+def classify_transaction(merchant_description: str, transaction_date: datetime, amount: float) -> int:
     """
     Classify a single transaction into a category.
     
     Priority order:
-    1. Ignore rules (return None if should ignore)
+    1. Ignore rules (return SKIPPED if should ignore)
     2. Hard merchant overrides
     3. Food-type detection + weekday/weekend rule
     4. Amount-based fallback
@@ -38,73 +45,130 @@ def classify_transaction(merchant_description: str, transaction_date: datetime,
         amount: Transaction amount (positive CAD)
         
     Returns:
-        Category name
+        Category ID (index into CATEGORIES), or SKIPPED
+    """
+    return _classify(merchant_description.upper(), transaction_date.weekday(), amount)
+
+
+def _classify(merchant_upper: str, weekday: int, amount: float) -> int:
+    """
+    Classify from precomputed inputs (see classify_transaction).
+    
+    Args:
+        merchant_upper: Uppercased merchant name
+        weekday: Transaction weekday (0=Monday, 6=Sunday)
+        amount: Transaction amount (positive CAD)
+        
+    Returns:
+        Category ID (index into CATEGORIES), or SKIPPED
     """
+    # Steps 1-3 share a single pattern scan of the merchant name
+    kind, override = classify_by_patterns(merchant_upper)
+    
     # Step 1: Check ignore rules
-    if should_ignore(merchant_description):
-        return None
+    if kind == IGNORE:
+        return SKIPPED
     
     # Step 2: Check hard merchant overrides
-    override = get_hard_override(merchant_description)
-    if override:
-        return override
+    if kind == OVERRIDE:
+        return CATEGORY_IDS[override]
     
     # Step 3: Food-type detection with weekday/weekend rule
-    if is_food_type_merchant(merchant_description, amount):
-        weekday = transaction_date.weekday()  # 0=Monday, 6=Sunday
+    # (no pattern at all falls back to the amount heuristic)
+    if kind == FOOD or (kind is None and is_meal_sized(merchant_upper, amount)):
         if weekday < 5:  # Monday-Friday
-            return 'school meals'
+            return CATEGORY_IDS['school meals']
         else:  # Saturday-Sunday
-            return 'food'
+            return CATEGORY_IDS['food']
     
     # Step 4: Amount-based fallback
     if amount >= 100:
-        return 'school'
+        return CATEGORY_IDS['school']
     elif amount <= 10:
-        return 'groceries'
+        return CATEGORY_IDS['groceries']
     else:
-        return 'other'
+        return CATEGORY_IDS['other']
 
 
-def aggregate_by_category(transactions: List, debug: bool = False) -> Dict[str, float]:
+def classify_columns(merchants_upper: List[str], weekdays: List[int], amounts: List[float]) -> List[int]:
     """
-    Classify and aggregate transactions by category.
+    Classify transactions given as parallel columns.
     
     Args:
-        transactions: List of Transaction objects
-        debug: If True, print skipped transactions
+        merchants_upper: Uppercased merchant names
+        weekdays: Transaction weekdays (0=Monday, 6=Sunday)
+        amounts: Transaction amounts (positive CAD)
         
     Returns:
-        Dictionary mapping category names to total amounts
+        Category ID (or SKIPPED) for each position
+    """
+    classify = _classify
+    return [classify(m, w, a) for m, w, a in zip(merchants_upper, weekdays, amounts)]
+
+
+def aggregate_columns(merchants: List[str], merchants_upper: List[str], dates: List[datetime],
+                      weekdays: List[int], amounts: List[float],
+                      debug: bool = False) -> Tuple[Dict[str, float], int]:
     """
-    category_totals = {cat: 0.0 for cat in CATEGORIES}
-    skipped_count = 0
-    skipped_transactions = []
+    Classify and aggregate transactions given as parallel columns.
     
-    for transaction in transactions:
-        category = classify_transaction(
-            transaction.merchant_description,
-            transaction.transaction_date,
-            transaction.amount
-        )
+    Args:
+        merchants: Merchant names (for debug output)
+        merchants_upper: Uppercased merchant names
+        dates: Transaction dates (for debug output)
+        weekdays: Transaction weekdays (0=Monday, 6=Sunday)
+        amounts: Transaction amounts (positive CAD)
+        debug: If True, print skipped transactions
         
-        if category is None:
-            skipped_count += 1
-            skipped_transactions.append(transaction)
+    Returns:
+        Dictionary mapping category names to total amounts, and the number
+        of skipped transactions
+    """
+    # Group amounts by category ID, then reduce each group with fsum
+    # (correctly rounded, so no error builds up across the additions;
+    # the totals are still binary floats, not exact decimal cents)
+    groups = [[] for _ in CATEGORIES]
+    skipped = []
+    
+    category_ids = classify_columns(merchants_upper, weekdays, amounts)
+    
+    for i, (category_id, amount) in enumerate(zip(category_ids, amounts)):
+        if category_id < 0:
+            skipped.append(i)
             continue
         
-        if category not in category_totals:
-            raise ValueError(f"Invalid category: {category}")
-        
-        category_totals[category] += transaction.amount
+        groups[category_id].append(amount)
     
-    # Remove categories with zero totals
-    category_totals = {k: v for k, v in category_totals.items() if v > 0}
+    # Name the categories, dropping those with zero totals
+    totals = [math.fsum(group) for group in groups]
+    category_totals = {CATEGORIES[i]: total for i, total in enumerate(totals) if total > 0}
     
-    if debug and skipped_transactions:
+    if debug and skipped:
         print("\nSkipped transactions:")
-        for t in skipped_transactions:
-            print(f"  {t.merchant_description[:50]:50s} ${t.amount:8.2f} ({t.transaction_date.date()})")
+        for i in skipped:
+            print(f"  {merchants[i][:50]:50s} ${amounts[i]:8.2f} ({dates[i].date()})")
     
-    return category_totals, skipped_count
+    return category_totals, len(skipped)
 
+
+def aggregate_by_category(transactions: List, debug: bool = False) -> Tuple[Dict[str, float], int]:
+    """
+    Classify and aggregate transactions by category.
+    
+    Args:
+        transactions: List of Transaction objects
+        debug: If True, print skipped transactions
+        
+    Returns:
+        Same as aggregate_columns
+    """
+    merchants = [t.merchant_description for t in transactions]
+    dates = [t.transaction_date for t in transactions]
+    return aggregate_columns(
+        merchants,
+        [m.upper() for m in merchants],
+        dates,
+        [d.weekday() for d in dates],
+        [t.amount for t in transactions],
+        debug=debug
+    )
@@ -3,6 +3,7 @@ Food-type merchant detection.
 
 Determines if a merchant sells prepared meals or drinks.
 """
+import re
 from typing import List
 
 
@@ -44,30 +45,43 @@ FOOD_EXCLUSIONS = [
 ]
 
 
-def is_food_type_merchant(merchant_description: str, amount: float) -> bool:
+# Compiled once so each check is a single search
+_FOOD_KW_RE = re.compile('|'.join(map(re.escape, FOOD_KEYWORDS)))
+_FOOD_EXCL_RE = re.compile('|'.join(map(re.escape, FOOD_EXCLUSIONS)))
+
+
+def is_food_type_merchant(merchant_upper: str, amount: float) -> bool:
     """
     Determine if a merchant is food-type (sells prepared meals/drinks).
     
     Args:
-        merchant_description: The merchant name
+        merchant_upper: The uppercased merchant name
         amount: Transaction amount
         
     Returns:
         True if merchant is food-type
     """
-    merchant_upper = merchant_description.upper()
-    
     # Check explicit exclusions first
-    if any(exclusion in merchant_upper for exclusion in FOOD_EXCLUSIONS):
+    if _FOOD_EXCL_RE.search(merchant_upper):
         return False
     
     # Check keyword matches
-    if any(keyword in merchant_upper for keyword in FOOD_KEYWORDS):
+    if _FOOD_KW_RE.search(merchant_upper):
         return True
     
-    # Fallback heuristic: amount <= 25 and merchant name length < 40
-    if amount <= 25 and len(merchant_description) < 40:
-        return True
+    return is_meal_sized(merchant_upper, amount)
+
+
+def is_meal_sized(merchant_description: str, amount: float) -> bool:
+    """
+    Fallback heuristic for merchants that match no keyword or exclusion.
     
-    return False
+    Args:
+        merchant_description: The merchant name
+        amount: Transaction amount
+        
+    Returns:
+        True if amount <= 25 and merchant name length < 40
+    """
+    return amount <= 25 and len(merchant_description) < 40
 
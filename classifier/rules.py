@@ -3,7 +3,10 @@ Classification rules for transactions.
 
 Contains hard merchant overrides and ignore patterns.
 """
-from typing import Optional, List
+import re
+from functools import lru_cache
+from typing import Optional, List, Tuple, Dict
+from .food_detector import FOOD_KEYWORDS, FOOD_EXCLUSIONS
 
 
 # Patterns that should be ignored (case-insensitive)
@@ -18,8 +21,8 @@ IGNORE_PATTERNS = [
 
 
 # Hard merchant overrides (highest priority)
-# Format: (prefix_pattern, category)
-# First match wins
+# Format: (pattern, category); pattern may appear anywhere in the merchant
+# First listed match wins
 HARD_OVERRIDES = [
     ('PRESTO', 'presto'),
     ('FLYWIRE', 'personal'),
@@ -37,35 +40,137 @@ HARD_OVERRIDES = [
 ]
 
 
-def should_ignore(merchant_description: str) -> bool:
+# Decision kinds returned by classify_by_patterns (highest priority first)
+IGNORE = 'ignore'
+OVERRIDE = 'override'
+NOT_FOOD = 'not_food'
+FOOD = 'food'
+
+
+# Ignore patterns only match at the start of a word, so FEE skips
+# "ANNUAL FEE" but not a coffee shop
+_IGNORE_PREFIX = r'\b'
+
+
+# Every pattern tagged with the decision it triggers, in priority order
+_PATTERN_TABLE = (
+    [(pattern, IGNORE, None) for pattern in IGNORE_PATTERNS]
+    + [(pattern, OVERRIDE, category) for pattern, category in HARD_OVERRIDES]
+    + [(pattern, NOT_FOOD, None) for pattern in FOOD_EXCLUSIONS]
+    + [(pattern, FOOD, None) for pattern in FOOD_KEYWORDS]
+)
+
+
+def _pattern_source(pattern: str, kind: str) -> str:
+    """Regex source for one literal pattern of the given decision kind."""
+    if kind == IGNORE:
+        return _IGNORE_PREFIX + re.escape(pattern)
+    return re.escape(pattern)
+
+
+def _compile_alternation(sources: List[str]) -> re.Pattern:
+    """
+    Compile pattern sources into one regex, tried in list order.
+    
+    Patterns stay str rather than bytes: ASCII merchant names are already
+    stored one byte per character, so a bytes regex searches no faster, and
+    encoding to ASCII would silently drop accented characters (e.g. CAFÉ).
+    """
+    return re.compile('|'.join(sources))
+
+
+def _rank_patterns(patterns: List[str]) -> Dict[str, int]:
+    """Map each pattern text to the index of its first occurrence."""
+    ranks = {}
+    for rank, pattern in enumerate(patterns):
+        ranks.setdefault(pattern, rank)
+    return ranks
+
+
+_IGNORE_RE = _compile_alternation([_pattern_source(pattern, IGNORE) for pattern in IGNORE_PATTERNS])
+
+_OVERRIDE_PATTERNS = [pattern for pattern, _ in HARD_OVERRIDES]
+_OVERRIDE_RE = _compile_alternation([_pattern_source(pattern, OVERRIDE) for pattern in _OVERRIDE_PATTERNS])
+_OVERRIDE_RANK = _rank_patterns(_OVERRIDE_PATTERNS)
+
+_PATTERN_RE = _compile_alternation([_pattern_source(pattern, kind) for pattern, kind, _ in _PATTERN_TABLE])
+_PATTERN_RANK = _rank_patterns([pattern for pattern, _, _ in _PATTERN_TABLE])
+
+
+def _best_rank(pattern_re: re.Pattern, ranks: Dict[str, int], merchant_upper: str) -> Optional[int]:
+    """
+    Find the highest-priority (lowest rank) pattern anywhere in the merchant.
+    
+    Alternatives are tried in priority order, so each hit is the best pattern
+    starting at that position. Each search resumes one character after the
+    previous hit started, so a pattern that starts inside an earlier,
+    lower-priority hit is still seen.
+    
+    Returns:
+        Rank of the best pattern found, None if nothing matches
+    """
+    best = None
+    match = pattern_re.search(merchant_upper)
+    while match:
+        rank = ranks[match.group()]
+        if best is None or rank < best:
+            best = rank
+            if best == 0:
+                # Nothing outranks the first pattern; stop probing
+                break
+        match = pattern_re.search(merchant_upper, match.start() + 1)
+    return best
+
+
+@lru_cache(maxsize=4096)
+def classify_by_patterns(merchant_upper: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Match a merchant against all pattern lists in a single scan.
+    
+    Results are cached by merchant name: statements repeat the same
+    merchants, and the cache is shared by every statement in the process.
+    
+    Args:
+        merchant_upper: The uppercased merchant name
+        
+    Returns:
+        (kind, category) for the highest-priority pattern found, where kind is
+        IGNORE, OVERRIDE, NOT_FOOD or FOOD and category is only set for
+        OVERRIDE. (None, None) if no pattern matches.
+    """
+    best = _best_rank(_PATTERN_RE, _PATTERN_RANK, merchant_upper)
+    if best is None:
+        return None, None
+    
+    _, kind, category = _PATTERN_TABLE[best]
+    return kind, category
+
+
+def should_ignore(merchant_upper: str) -> bool:
     """
     Check if a transaction should be ignored.
     
     Args:
-        merchant_description: The merchant name from the transaction
+        merchant_upper: The uppercased merchant name from the transaction
         
     Returns:
         True if transaction should be ignored
     """
-    merchant_upper = merchant_description.upper()
-    return any(pattern in merchant_upper for pattern in IGNORE_PATTERNS)
+    return _IGNORE_RE.search(merchant_upper) is not None
 
 
-def get_hard_override(merchant_description: str) -> Optional[str]:
+def get_hard_override(merchant_upper: str) -> Optional[str]:
     """
     Check for hard merchant override.
     
     Args:
-        merchant_description: The merchant name from the transaction
+        merchant_upper: The uppercased merchant name from the transaction
         
     Returns:
         Category name if override found, None otherwise
     """
-    merchant_upper = merchant_description.upper()
+    best = _best_rank(_OVERRIDE_RE, _OVERRIDE_RANK, merchant_upper)
+    if best is None:
+        return None
     
-    for pattern, category in HARD_OVERRIDES:
-        if merchant_upper.startswith(pattern) or pattern in merchant_upper:
-            return category
-    
-    return None
-
+    return HARD_OVERRIDES[best][1]
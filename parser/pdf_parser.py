@@ -3,17 +3,93 @@ PDF Parser for RBC Credit Card Statements.
 
 Extracts transaction data from PDF statements.
 """
+import math
+import mmap
+import multiprocessing
+import os
 import re
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
-import pdfplumber
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+
+# Supported text extraction backends ('auto' picks PyMuPDF, see PDFParser)
+BACKENDS = ('auto', 'pdftotext', 'pymupdf', 'pdfplumber')
+
+# Max vertical distance (points) between words on the same text line
+_LINE_TOLERANCE = 3
+
+# Pages handed to each worker process, to amortize process startup
+_PAGES_PER_TASK = 4
+# Upper bound on worker processes for page parsing
+_MAX_WORKERS = 6
+
+
+# Month abbreviations
+_MONTHS = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
+}
+
+
+# Precompiled patterns used by the per-row/per-line extraction loops.
+# re.ASCII: statement digits are ASCII, so \d need not consult Unicode tables.
+_DATE_CELL_RE = re.compile(r'(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?', re.ASCII)
+_AMOUNT_RE = re.compile(r'[\$]?([\d,]+\.\d{2})', re.ASCII)
+# One transaction line: [MON DD] MON DD DESCRIPTION $XX.XX
+# The date must lead the line, so summary lines that merely mention a date
+# (e.g. "MINIMUM PAYMENT DUE DATE JAN 15, 2026 $10.00") are not matched.
+# The optional leading date is the posting date; month/day capture the
+# transaction date, restricted to the _MONTHS keys so no lookup can miss.
+# Whitespace is [ \t] so a match never spans two lines.
+_RBC_LINE_RE = re.compile(
+    r'^[ \t]*(?:[A-Z]{3}[ \t]+\d{1,2}[ \t]+)?(?P<month>' + '|'.join(_MONTHS) + r')[ \t]+(?P<day>\d{1,2})'
+    r'(?P<desc>.*?)\$[ \t]*(?P<amount>[\d,]+\.\d{2})[ \t]*$',
+    re.MULTILINE | re.ASCII
+)
+# An amount followed by a wide gap and more text, in pdftotext -layout output
+_LAYOUT_AMOUNT_GAP_RE = re.compile(r'(\$[ \t]*[\d,]+\.\d{2})[ \t]{2,}(?=\S)', re.ASCII)
+
+
+@lru_cache(maxsize=None)
+def _have_pdftotext() -> bool:
+    """
+    Check whether poppler's pdftotext (the fastest text extractor) is installed.
+    
+    Looked up on first use rather than at import, so the CLI does not search
+    PATH just to show --help.
+    """
+    return shutil.which('pdftotext') is not None
+
+
+def _is_reference_number(part: str) -> bool:
+    """
+    Check if a description token is an ID rather than part of the merchant.
+    
+    Matches long numeric transaction IDs (15+ digits) and numbers with
+    dashes (account numbers, e.g. 12-345).
+    """
+    if part.isdigit():
+        return len(part) >= 15
+    head, dash, tail = part.partition('-')
+    return bool(dash) and head.isdigit() and tail.isdigit()
 
 
 class Transaction:
-    """Represents a single credit card transaction."""
+    """
+    Represents a single credit card transaction.
+    
+    The merchant description is expected to be stripped already; the
+    extraction methods normalize whitespace when they build it.
+    """
+    
+    __slots__ = ('merchant_description', 'transaction_date', 'amount')
     
     def __init__(self, merchant_description: str, transaction_date: datetime, amount: float):
-        self.merchant_description = merchant_description.strip()
+        self.merchant_description = merchant_description
         self.transaction_date = transaction_date
         self.amount = amount
     
@@ -24,9 +100,48 @@ class Transaction:
 class PDFParser:
     """Parses RBC credit card PDF statements."""
     
-    def __init__(self, pdf_path: str):
+    def __init__(self, pdf_path: str, use_tables: bool = False, backend: str = 'auto'):
+        """
+        Initialize the parser.
+        
+        Args:
+            pdf_path: Path to the PDF statement
+            use_tables: If True, also run pdfplumber table extraction on each
+                page. It is the slowest part of parsing and the text parser
+                already covers RBC statements, so it is off by default.
+                Requires the pdfplumber backend.
+            backend: Text extraction backend, one of BACKENDS. 'auto' uses
+                PyMuPDF (or pdfplumber when use_tables is set), so results
+                do not depend on what else is installed; 'pdftotext' (faster,
+                needs poppler on PATH) must be asked for explicitly.
+                pdfplumber is the fallback for PDFs with unusual encodings.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend} (expected one of {', '.join(BACKENDS)})")
+        if backend == 'auto':
+            backend = 'pdfplumber' if use_tables else 'pymupdf'
+        if use_tables and backend != 'pdfplumber':
+            raise ValueError("Table extraction requires the pdfplumber backend")
+        if backend == 'pdftotext' and not _have_pdftotext():
+            raise ValueError("The pdftotext backend requires poppler's pdftotext on PATH")
+        
         self.pdf_path = pdf_path
-        self.transactions: List[Transaction] = []
+        self.use_tables = use_tables
+        self.backend = backend
+        # Parsed transactions as parallel columns (filled by parse())
+        self.merchants: List[str] = []
+        self.merchants_upper: List[str] = []
+        self.dates: List[datetime] = []
+        self.weekdays: List[int] = []
+        self.amounts: List[float] = []
+        self._transactions: Optional[List[Transaction]] = None
+        self._total: Optional[float] = None
+        self._set_now(datetime.now())
+    
+    def _set_now(self, now: datetime):
+        """Snapshot the date used to infer the year of year-less dates."""
+        self._now_year = now.year
+        self._now_month = now.month
     
     def parse(self, debug: bool = False) -> List[Transaction]:
         """
@@ -38,68 +153,261 @@ class PDFParser:
         Returns:
             List of Transaction objects
         """
-        transactions = []
+        self.extract(debug)
+        return self.transactions
+    
+    def extract(self, debug: bool = False):
+        """
+        Parse the PDF into the column attributes (merchants, dates, amounts, ...).
+        
+        Unlike parse(), no Transaction objects are built; the transactions
+        property creates them from the columns only when it is read.
+        
+        Args:
+            debug: If True, print debug information about extracted content
+        """
+        # One snapshot per parse, shared by all workers
+        now = datetime.now()
+        self._set_now(now)
+        
+        if self.backend == 'pdftotext':
+            rows = self._parse_with_pdftotext(debug)
+        elif self.backend == 'pymupdf':
+            rows = self._parse_with_pymupdf(debug)
+        else:
+            rows = self._parse_with_pdfplumber(now, debug)
+        
+        # Store as columns; uppercase and weekday are computed once here
+        # so the classifier never has to derive them again
+        self.merchants = [merchant for merchant, _, _ in rows]
+        self.merchants_upper = [merchant.upper() for merchant in self.merchants]
+        self.dates = [transaction_date for _, transaction_date, _ in rows]
+        self.weekdays = [transaction_date.weekday() for transaction_date in self.dates]
+        self.amounts = [amount for _, _, amount in rows]
+        self._transactions = None
+        self._total = math.fsum(self.amounts)
+    
+    def _parse_with_pdftotext(self, debug: bool = False) -> List[Tuple[str, datetime, float]]:
+        """
+        Extract transactions from the text produced by poppler's pdftotext.
+        
+        Returns:
+            (merchant_description, transaction_date, amount) tuples, in page order
+        """
+        # '--' so a path starting with '-' is not taken for an option
+        result = subprocess.run(
+            ['pdftotext', '-layout', '--', self.pdf_path, '-'],
+            capture_output=True
+        )
+        if result.returncode != 0:
+            reason = result.stderr.decode('utf-8', errors='replace').strip()
+            raise ValueError(f"pdftotext failed on {self.pdf_path}: "
+                             f"{reason or f'exit status {result.returncode}'}")
+        
+        text = result.stdout.decode('utf-8', errors='replace')
+        # -layout keeps side-by-side columns on one line; end the line at a
+        # transaction amount so text to its right cannot hide the amount
+        text = _LAYOUT_AMOUNT_GAP_RE.sub('\\1\n', text)
+        # pdftotext separates pages with form feeds
+        pages_text = text.split('\f')
+        return self._rows_from_pages_text(pages_text, debug)
+    
+    def _parse_with_pymupdf(self, debug: bool = False) -> List[Tuple[str, datetime, float]]:
+        """
+        Extract transactions using PyMuPDF text extraction.
+        
+        The file is memory-mapped and handed to PyMuPDF as a zero-copy
+        buffer, so pages are served straight from the page cache instead
+        of through a second buffered file handle.
+        
+        Returns:
+            (merchant_description, transaction_date, amount) tuples, in page order
+        """
+        import pymupdf
+        
+        # An empty file cannot be mapped
+        if os.path.getsize(self.pdf_path) == 0:
+            raise ValueError(f"Empty PDF file: {self.pdf_path}")
+        
+        with open(self.pdf_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                with pymupdf.open(stream=view, filetype='pdf') as doc:
+                    pages_text = [_pymupdf_page_text(page) for page in doc]
+            finally:
+                # The document (or a traceback) may still reference the view;
+                # release it explicitly so the map can be closed
+                view.release()
+        return self._rows_from_pages_text(pages_text, debug)
+    
+    def _rows_from_pages_text(self, pages_text: List[str], debug: bool = False) -> List[Tuple[str, datetime, float]]:
+        """
+        Extract transactions from already-extracted page texts.
+        
+        Args:
+            pages_text: Text of each page, in order
+            debug: If True, print debug information about extracted content
+        
+        Returns:
+            (merchant_description, transaction_date, amount) tuples, in page order
+        """
+        if debug:
+            for page_num, text in enumerate(pages_text, 1):
+                print(f"\n--- Page {page_num} ---")
+                print("\nText extraction (first 500 chars):")
+                print(text[:500])
+                print("...")
+        
+        rows = self._extract_transactions_from_text('\n'.join(pages_text))
+        if debug:
+            print(f"\nExtracted {len(rows)} transactions from text")
+        
+        return rows
+    
+    def _parse_with_pdfplumber(self, now: datetime, debug: bool = False) -> List[Tuple[str, datetime, float]]:
+        """
+        Extract transactions using pdfplumber.
+        
+        Pages are split into batches of _PAGES_PER_TASK and parsed in worker
+        processes; results are concatenated in page order.
+        
+        Args:
+            now: Reference date for year-less dates
+            debug: If True, print debug information about extracted content
+        
+        Returns:
+            (merchant_description, transaction_date, amount) tuples, in page order
+        """
+        import pdfplumber
         
         with pdfplumber.open(self.pdf_path) as pdf:
-            for page_num, page in enumerate(pdf.pages, 1):
-                if debug:
-                    print(f"\n--- Page {page_num} ---")
-                
-                # Try table extraction first (more reliable for structured data)
-                tables = page.extract_tables()
-                if debug:
-                    print(f"Found {len(tables) if tables else 0} tables")
-                
-                table_transactions = []
-                if tables:
-                    for table_num, table in enumerate(tables):
-                        if debug:
-                            print(f"\nTable {table_num + 1} (first 3 rows):")
-                            for i, row in enumerate(table[:3]):
-                                print(f"  Row {i}: {row}")
-                        
-                        page_transactions = self._extract_transactions_from_table(table)
-                        table_transactions.extend(page_transactions)
-                        if debug:
-                            print(f"  Extracted {len(page_transactions)} transactions from this table")
-                
-                # Always try text extraction as well (RBC statements may have mixed formats)
-                text = page.extract_text()
-                if text:
+            page_count = len(pdf.pages)
+        
+        page_numbers = list(range(1, page_count + 1))
+        batches = [page_numbers[i:i + _PAGES_PER_TASK]
+                   for i in range(0, page_count, _PAGES_PER_TASK)]
+        
+        # A single batch is not worth a process pool, and debug output
+        # is only readable when pages are parsed in order
+        if debug or len(batches) <= 1:
+            results = [_parse_page_batch(self.pdf_path, batch, now, self.use_tables, debug)
+                       for batch in batches]
+        else:
+            max_workers = min(os.cpu_count() or 1, _MAX_WORKERS, len(batches))
+            # When this parse itself runs in a worker process (several PDFs
+            # at once), spawn the page workers instead of forking them
+            mp_context = None
+            if multiprocessing.parent_process() is not None:
+                mp_context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+                results = list(executor.map(
+                    _parse_page_batch,
+                    [self.pdf_path] * len(batches),
+                    batches,
+                    [now] * len(batches),
+                    [self.use_tables] * len(batches),
+                    [debug] * len(batches)
+                ))
+        
+        return [row for batch_rows in results for row in batch_rows]
+    
+    @property
+    def transactions(self) -> List[Transaction]:
+        """Parsed transactions as objects, built from the columns on first access."""
+        if self._transactions is None:
+            self._transactions = [
+                Transaction(merchant, transaction_date, amount)
+                for merchant, transaction_date, amount in zip(self.merchants, self.dates, self.amounts)
+            ]
+        return self._transactions
+    
+    def _parse_page(self, page, page_num: int, debug: bool = False) -> List[Tuple[str, datetime, float]]:
+        """
+        Extract transactions from a single pdfplumber page.
+        
+        Args:
+            page: pdfplumber page object
+            page_num: 1-based page number (for debug output)
+            debug: If True, print debug information about extracted content
+        
+        Returns:
+            (merchant_description, transaction_date, amount) tuples found on the page
+        """
+        transactions = []
+        
+        if debug:
+            print(f"\n--- Page {page_num} ---")
+        
+        text = page.extract_text()
+        
+        table_transactions = []
+        # Pages without any amount (cover, summary, legal text) cannot hold
+        # transactions, so skip the expensive table detection on them
+        if self.use_tables and text and _AMOUNT_RE.search(text):
+            # Try table extraction first (more reliable for structured data)
+            tables = page.extract_tables()
+            if debug:
+                print(f"Found {len(tables) if tables else 0} tables")
+            
+            if tables:
+                for table_num, table in enumerate(tables):
                     if debug:
-                        print(f"\nText extraction (first 500 chars):")
-                        print(text[:500])
-                        print("...")
+                        print(f"\nTable {table_num + 1} (first 3 rows):")
+                        for i, row in enumerate(table[:3]):
+                            print(f"  Row {i}: {row}")
                     
-                    text_transactions = self._extract_transactions_from_text(text)
+                    page_transactions = self._extract_transactions_from_table(table)
+                    table_transactions.extend(page_transactions)
                     if debug:
-                        print(f"Extracted {len(text_transactions)} transactions from text")
-                    
-                    # Combine transactions, avoiding duplicates
-                    # (prefer table extraction if both found the same transaction)
-                    if table_transactions:
-                        # Use table transactions, add text transactions that aren't duplicates
-                        transactions.extend(table_transactions)
-                        # Simple deduplication: check if merchant+amount+date match
-                        existing = {(t.merchant_description, t.amount, t.transaction_date.date()) 
-                                   for t in table_transactions}
-                        for t in text_transactions:
-                            key = (t.merchant_description, t.amount, t.transaction_date.date())
-                            if key not in existing:
-                                transactions.append(t)
-                                existing.add(key)
-                    else:
-                        transactions.extend(text_transactions)
+                        print(f"  Extracted {len(page_transactions)} transactions from this table")
+        
+        # Parse the text as well (RBC statements may have mixed formats)
+        if text:
+            if debug:
+                print("\nText extraction (first 500 chars):")
+                print(text[:500])
+                print("...")
+            
+            text_transactions = self._extract_transactions_from_text(text)
+            if debug:
+                print(f"Extracted {len(text_transactions)} transactions from text")
+            
+            # Combine transactions, avoiding duplicates
+            # (prefer table extraction if both found the same transaction)
+            if table_transactions:
+                # Use table transactions, add text transactions that aren't duplicates
+                # Simple deduplication: the merchant+date+amount rows match
+                # (parsed dates are always midnight, so the datetime is the date)
+                transactions.extend(table_transactions)
+                seen = set(table_transactions)
+                for row in text_transactions:
+                    if row not in seen:
+                        seen.add(row)
+                        transactions.append(row)
+            else:
+                transactions.extend(text_transactions)
         
-        self.transactions = transactions
         return transactions
     
-    def _extract_transactions_from_table(self, table: List[List]) -> List[Transaction]:
+    def _extract_transactions_from_table(self, table: List[List]) -> List[Tuple[str, datetime, float]]:
         """
         Extract transactions from a table structure.
         
         RBC statements often have tables with columns: Date, Description, Amount
+        
+        Column roles are read from the header row when it can be recognized;
+        otherwise each cell is classified by content.
         """
+        # Header row is the first non-empty row
+        for header_index, header in enumerate(table):
+            if header and any(header):
+                columns = self._find_table_columns(header)
+                if columns:
+                    return self._extract_transactions_by_columns(
+                        table[header_index + 1:], *columns
+                    )
+                break
+        
         transactions = []
         
         for row in table:
@@ -118,13 +426,13 @@ class PDFParser:
                 cell_str = str(cell).strip()
                 
                 # Check for date pattern (MM/DD or MM/DD/YY)
-                date_match = re.match(r'(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?', cell_str)
+                date_match = _DATE_CELL_RE.match(cell_str)
                 if date_match and not date_str:
                     date_str = cell_str
                     continue
                 
                 # Check for amount pattern ($XX.XX or XX.XX)
-                amount_match = re.search(r'[\$]?([\d,]+\.\d{2})', cell_str)
+                amount_match = _AMOUNT_RE.search(cell_str)
                 if amount_match and amount is None:
                     amount_str = amount_match.group(1).replace(',', '')
                     try:
@@ -147,132 +455,123 @@ class PDFParser:
                     try:
                         transaction_date = self._parse_date(date_str)
                         if transaction_date:
-                            transaction = Transaction(merchant, transaction_date, amount)
-                            transactions.append(transaction)
+                            transactions.append((merchant, transaction_date, amount))
                     except (ValueError, IndexError):
                         pass
         
         return transactions
     
-    def _extract_transactions_from_text(self, text: str) -> List[Transaction]:
+    def _find_table_columns(self, header: List) -> Optional[Tuple[int, int, int]]:
+        """
+        Infer column roles from a table header row.
+        
+        Returns:
+            (date_col, description_col, amount_col), or None if any is missing.
+            The transaction date column is preferred over the posting date.
+        """
+        date_col = desc_col = amount_col = None
+        
+        for i, cell in enumerate(header):
+            if not cell:
+                continue
+            
+            label = str(cell).upper()
+            if 'DATE' in label:
+                if date_col is None or 'TRANSACTION' in label:
+                    date_col = i
+            elif 'DESCRIPTION' in label or 'MERCHANT' in label:
+                if desc_col is None:
+                    desc_col = i
+            elif 'AMOUNT' in label:
+                if amount_col is None:
+                    amount_col = i
+        
+        if date_col is None or desc_col is None or amount_col is None:
+            return None
+        return date_col, desc_col, amount_col
+    
+    def _extract_transactions_by_columns(self, rows: List[List], date_col: int,
+                                         desc_col: int, amount_col: int) -> List[Tuple[str, datetime, float]]:
+        """
+        Extract transactions from table rows with known column roles.
+        """
+        transactions = []
+        width = max(date_col, desc_col, amount_col) + 1
+        
+        for row in rows:
+            if not row or len(row) < width:
+                continue
+            
+            date_str = str(row[date_col] or '').strip()
+            if not _DATE_CELL_RE.match(date_str):
+                continue
+            
+            amount_match = _AMOUNT_RE.search(str(row[amount_col] or ''))
+            if not amount_match:
+                continue
+            
+            merchant = ' '.join(str(row[desc_col] or '').split())
+            if len(merchant) < 2:
+                continue
+            
+            amount = float(amount_match.group(1).replace(',', ''))
+            
+            # Only process purchases (positive amounts)
+            if amount > 0:
+                transaction_date = self._parse_date(date_str)
+                if transaction_date:
+                    transactions.append((merchant, transaction_date, amount))
+        
+        return transactions
+    
+    def _extract_transactions_from_text(self, text: str) -> List[Tuple[str, datetime, float]]:
         """
         Extract transactions from page text.
         
         RBC statements have transactions in format:
         MON DD MON DD MERCHANT NAME                    $XX.XX
         e.g., "NOV 25 NOV 27 MCDONALD'S #40392 BRAMPTON ON $3.38"
+        
+        The whole page is scanned in one pass with _RBC_LINE_RE; header and
+        summary lines never match because they do not start with a date or
+        lack a trailing amount.
+        
+        Returns:
+            (merchant_description, transaction_date, amount) tuples
         """
         transactions = []
-        lines = text.split('\n')
-        
-        # Month abbreviations
-        months = {
-            'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
-            'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
-        }
-        
-        # Pattern for RBC format: MON DD MON DD (two dates - posting and transaction)
-        # We'll use the second date (transaction date)
-        rbc_date_pattern = r'([A-Z]{3})\s+(\d{1,2})\s+([A-Z]{3})\s+(\d{1,2})'
-        # Also handle single date format: MON DD
-        single_date_pattern = r'([A-Z]{3})\s+(\d{1,2})'
-        # Amount pattern: $XX.XX at end of line
-        amount_pattern = r'\$\s*([\d,]+\.\d{2})\s*$'
-        
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # Skip empty lines
-            if not line:
-                i += 1
-                continue
-            
-            # Skip header lines
-            if any(header in line.upper() for header in ['TRANSACTION', 'POSTING', 'ACTIVITY', 'DESCRIPTION', 'AMOUNT', 'DATE']):
-                i += 1
+        
+        for match in _RBC_LINE_RE.finditer(text):
+            month = _MONTHS[match.group('month')]
+            year = self._now_year
+            # If month is > current month, it's probably last year
+            if month > self._now_month:
+                year -= 1
+            try:
+                transaction_date = datetime(year, month, int(match.group('day')))
+            except ValueError:
                 continue
             
-            # Try RBC double date format first (MON DD MON DD)
-            date_match = re.search(rbc_date_pattern, line)
-            transaction_date = None
-            date_end = 0
+            # Skip long numeric IDs (transaction IDs, account numbers, etc.)
+            merchant = ' '.join(
+                part for part in match.group('desc').split()
+                if not _is_reference_number(part)
+            )
             
-            if date_match:
-                # Use the second date (transaction date, not posting date)
-                month_str = date_match.group(3)
-                day = int(date_match.group(4))
-                date_end = date_match.end()
-                
-                if month_str in months:
-                    month = months[month_str]
-                    year = datetime.now().year
-                    # If month is > current month, it's probably last year
-                    if month > datetime.now().month:
-                        year = datetime.now().year - 1
-                    transaction_date = datetime(year, month, day)
-            else:
-                # Try single date format
-                single_match = re.search(single_date_pattern, line)
-                if single_match:
-                    month_str = single_match.group(1)
-                    day = int(single_match.group(2))
-                    date_end = single_match.end()
-                    
-                    if month_str in months:
-                        month = months[month_str]
-                        year = datetime.now().year
-                        if month > datetime.now().month:
-                            year = datetime.now().year - 1
-                        transaction_date = datetime(year, month, day)
+            # Skip if merchant is too short or empty
+            if len(merchant) < 2:
+                continue
             
-            if transaction_date:
-                # Look for amount at end of line
-                amount_match = re.search(amount_pattern, line)
-                
-                if amount_match:
-                    # Extract text between date and amount
-                    amount_start = amount_match.start()
-                    text_between = line[date_end:amount_start].strip()
-                    
-                    # Skip long numeric IDs (transaction IDs, account numbers, etc.)
-                    # These are typically 15+ digits
-                    parts = text_between.split()
-                    merchant_parts = []
-                    
-                    for part in parts:
-                        # Skip parts that are just long numbers (likely transaction IDs)
-                        if part.isdigit() and len(part) >= 15:
-                            continue
-                        # Skip parts that are just numbers with dashes (account numbers)
-                        if re.match(r'^\d+-\d+$', part):
-                            continue
-                        merchant_parts.append(part)
-                    
-                    merchant = ' '.join(merchant_parts).strip()
-                    
-                    # Clean up merchant name
-                    merchant = re.sub(r'\s+', ' ', merchant)
-                    
-                    # Skip if merchant is too short or empty
-                    if len(merchant) < 2:
-                        i += 1
-                        continue
-                    
-                    # Parse amount
-                    amount_str = amount_match.group(1).replace(',', '')
-                    try:
-                        amount = float(amount_str)
-                    except ValueError:
-                        i += 1
-                        continue
-                    
-                    # Only process purchases (positive amounts)
-                    if amount > 0:
-                        transaction = Transaction(merchant, transaction_date, amount)
-                        transactions.append(transaction)
+            # Parse amount
+            amount_str = match.group('amount').replace(',', '')
+            try:
+                amount = float(amount_str)
+            except ValueError:
+                continue
             
-            i += 1
+            # Only process purchases (positive amounts)
+            if amount > 0:
+                transactions.append((merchant, transaction_date, amount))
         
         return transactions
     
@@ -286,10 +585,10 @@ class PDFParser:
             parts = date_str.split('/')
             if len(parts) == 2:
                 month, day = map(int, parts)
-                year = datetime.now().year
+                year = self._now_year
                 # If month is > current month, it's probably last year
-                if month > datetime.now().month:
-                    year = datetime.now().year - 1
+                if month > self._now_month:
+                    year -= 1
             elif len(parts) == 3:
                 month, day, year_part = parts
                 month, day = int(month), int(day)
@@ -305,6 +604,67 @@ class PDFParser:
             return None
     
     def get_total_purchases(self) -> float:
-        """Calculate total of all transactions."""
-        return sum(t.amount for t in self.transactions)
+        """
+        Total of all transactions, computed once by parse().
+        
+        Raises:
+            RuntimeError: If parse() has not been called yet
+        """
+        if self._total is None:
+            raise RuntimeError("get_total_purchases() called before parse()")
+        return self._total
 
+
+def _pymupdf_page_text(page) -> str:
+    """
+    Rebuild a page's text lines from PyMuPDF word boxes.
+    
+    Words are grouped into lines by their top coordinate and ordered left
+    to right, like pdfplumber's extract_text(). Plain get_text('text')
+    follows content-stream order, which can put the date, description and
+    amount columns of a statement row on separate lines.
+    """
+    words = sorted(page.get_text('words'), key=lambda w: (w[1], w[0]))
+    
+    lines = []
+    line_words = []
+    line_top = None
+    for x0, top, _, _, word, *_ in words:
+        if line_top is None or top - line_top > _LINE_TOLERANCE:
+            if line_words:
+                lines.append(' '.join(w for _, w in sorted(line_words)))
+            line_words = []
+            line_top = top
+        line_words.append((x0, word))
+    if line_words:
+        lines.append(' '.join(w for _, w in sorted(line_words)))
+    
+    return '\n'.join(lines)
+
+
+def _parse_page_batch(pdf_path: str, page_numbers: List[int], now: datetime,
+                      use_tables: bool = False, debug: bool = False) -> List[Tuple[str, datetime, float]]:
+    """
+    Parse a batch of pages from a PDF (runs in a worker process).
+    
+    Args:
+        pdf_path: Path to the PDF statement
+        page_numbers: 1-based page numbers to parse
+        now: Reference date for year-less dates (snapshot from the parent)
+        use_tables: If True, also run table extraction (see PDFParser)
+        debug: If True, print debug information about extracted content
+    
+    Returns:
+        (merchant_description, transaction_date, amount) tuples, in page order
+    """
+    import pdfplumber
+    
+    parser = PDFParser(pdf_path, use_tables=use_tables, backend='pdfplumber')
+    parser._set_now(now)
+    rows = []
+    
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        for page_num, page in zip(page_numbers, pdf.pages):
+            rows.extend(parser._parse_page(page, page_num, debug))
+    
+    return rows
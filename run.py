@@ -3,22 +3,44 @@
 Main entry point for credit statement to sheets tool.
 
 CLI Usage:
-    python run.py --pdf path/to/statement.pdf --month "December 2025" --sheet-id <GOOGLE_SHEET_ID>
+    python run.py --pdf path/to/statement.pdf [more.pdf ...] --month "December 2025" --sheet-id <GOOGLE_SHEET_ID>
 """
 import argparse
+import math
+import os
 import sys
-import yaml
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from parser.pdf_parser import PDFParser
-from classifier.classify import aggregate_by_category
-from sheets.writer import SheetsWriter
+from parser.pdf_parser import PDFParser, BACKENDS
 
 
 def load_config(config_path: str = 'config.yaml') -> dict:
     """Load configuration from YAML file."""
+    import yaml
+    try:
+        # libyaml's C parser, when PyYAML was built with it
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader
+    
     with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=Loader)
+
+
+def _existing_path(value: str) -> Path:
+    """argparse type for paths that must already exist."""
+    path = Path(value)
+    if not path.exists():
+        raise argparse.ArgumentTypeError(f"file not found: {value}")
+    return path
+
+
+def parse_statement(pdf_path: Path, backend: str, debug: bool = False) -> PDFParser:
+    """Parse one PDF statement and return the parser holding its transactions."""
+    pdf_parser = PDFParser(str(pdf_path), backend=backend)
+    pdf_parser.extract(debug=debug)
+    return pdf_parser
 
 
 def main():
@@ -28,12 +50,16 @@ def main():
     parser.add_argument(
         '--pdf',
         required=True,
-        help='Path to PDF statement file'
+        nargs='+',
+        type=_existing_path,
+        help='Path to PDF statement file(s); totals are combined across files of the same month'
     )
     parser.add_argument(
         '--month',
         required=True,
-        help='Statement month (e.g., "December 2025")'
+        nargs='+',
+        help='Statement month (e.g., "December 2025"); give one per PDF to '
+             'write each statement under its own month'
     )
     parser.add_argument(
         '--sheet-id',
@@ -45,6 +71,12 @@ def main():
         default='config.yaml',
         help='Path to config file (default: config.yaml)'
     )
+    parser.add_argument(
+        '--backend',
+        choices=BACKENDS,
+        default='auto',
+        help='PDF text extraction backend (default: auto, which uses PyMuPDF)'
+    )
     parser.add_argument(
         '--debug',
         action='store_true',
@@ -52,12 +84,15 @@ def main():
     )
     
     args = parser.parse_args()
+    if len(args.month) not in (1, len(args.pdf)):
+        parser.error('give either one --month or one per --pdf file')
     
-    # Validate PDF file exists
-    pdf_path = Path(args.pdf)
-    if not pdf_path.exists():
-        print(f"Error: PDF file not found: {args.pdf}")
-        sys.exit(1)
+    # Deferred so --help and usage errors return without loading these
+    from classifier.classify import aggregate_columns
+    from sheets.writer import SheetsWriter
+    
+    # PDF and config paths were already checked by argparse
+    pdf_paths = args.pdf
     
     # Load configuration
     try:
@@ -75,45 +110,87 @@ def main():
         print("Please create a service account and download credentials.json")
         sys.exit(1)
     
-    # Parse PDF
-    print(f"Parsing PDF: {args.pdf}")
-    pdf_parser = PDFParser(str(pdf_path))
+    # Parse PDFs, one worker process per file. Processes rather than threads:
+    # PyMuPDF is not thread-safe, and the pdfplumber backend starts its own
+    # process pool, which must not be forked from a multithreaded process.
+    # A single file, or debug mode (so output stays readable), runs inline.
+    for pdf_path in pdf_paths:
+        print(f"Parsing PDF: {pdf_path}")
     try:
-        transactions = pdf_parser.parse(debug=args.debug)
-        print(f"Found {len(transactions)} transactions")
+        if args.debug or len(pdf_paths) == 1:
+            pdf_parsers = [parse_statement(pdf_path, args.backend, args.debug)
+                           for pdf_path in pdf_paths]
+        else:
+            max_workers = min(len(pdf_paths), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                pdf_parsers = list(executor.map(
+                    parse_statement,
+                    pdf_paths,
+                    [args.backend] * len(pdf_paths),
+                    [args.debug] * len(pdf_paths)
+                ))
     except Exception as e:
         print(f"Error parsing PDF: {e}")
         sys.exit(1)
     
-    if not transactions:
+    transaction_count = sum(len(pdf_parser.amounts) for pdf_parser in pdf_parsers)
+    print(f"Found {transaction_count} transactions")
+    
+    if not transaction_count:
         print("Warning: No transactions found in PDF")
         sys.exit(1)
     
-    # Classify and aggregate
+    # Classify and aggregate, combining totals of statements for the same month
     print("Classifying transactions...")
-    category_totals, skipped_count = aggregate_by_category(transactions, debug=args.debug)
+    pdf_months = args.month * len(pdf_parsers) if len(args.month) == 1 else args.month
+    month_totals = {}
+    skipped_count = 0
+    for pdf_parser, month in zip(pdf_parsers, pdf_months):
+        statement_totals, statement_skipped = aggregate_columns(
+            pdf_parser.merchants,
+            pdf_parser.merchants_upper,
+            pdf_parser.dates,
+            pdf_parser.weekdays,
+            pdf_parser.amounts,
+            debug=args.debug
+        )
+        category_totals = month_totals.setdefault(month, {})
+        for category, amount in statement_totals.items():
+            category_totals[category] = category_totals.get(category, 0.0) + amount
+        skipped_count += statement_skipped
     
     if skipped_count > 0:
         print(f"Skipped {skipped_count} transactions (payments, fees, etc.)")
     
-    # Print summary
-    print("\nCategory Totals:")
-    print("-" * 40)
-    total = 0.0
-    for category, amount in sorted(category_totals.items()):
-        print(f"{category:20s} ${amount:10.2f}")
-        total += amount
+    # Sorted once; the same order is used for printing and for the sheet rows
+    month_items = {month: sorted(category_totals.items())
+                   for month, category_totals in month_totals.items()}
+    total = math.fsum(amount for items in month_items.values() for _, amount in items)
+    pdf_total = math.fsum(pdf_parser.get_total_purchases() for pdf_parser in pdf_parsers)
     
-    print("-" * 40)
-    print(f"{'Total':20s} ${total:10.2f}")
+    # Print summary, built up and written in one go
+    separator = "-" * 40
+    lines = []
+    for month, items in month_items.items():
+        lines.append("\nCategory Totals:" if len(month_items) == 1 else f"\nCategory Totals ({month}):")
+        lines.append(separator)
+        lines.extend([f"{category:20s} ${amount:10.2f}" for category, amount in items])
+        lines.append(separator)
+        lines.append(f"{'Total':20s} ${math.fsum(amount for _, amount in items):10.2f}")
     
     # Validate totals match
-    pdf_total = pdf_parser.get_total_purchases()
-    print(f"\nPDF total purchases: ${pdf_total:.2f}")
-    print(f"Classified total: ${total:.2f}")
+    lines.append(f"\nPDF total purchases: ${pdf_total:.2f}")
+    lines.append(f"Classified total: ${total:.2f}")
     
     if abs(pdf_total - total) > 0.01:  # Allow small floating point differences
-        print("Warning: Totals don't match exactly. This may be due to skipped transactions.")
+        lines.append("Warning: Totals don't match exactly. This may be due to skipped transactions.")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    
+    # Don't touch the sheet when there is nothing to write
+    if not any(month_items.values()):
+        print("Error: No category totals to write")
+        sys.exit(2)
     
     # Write to Google Sheets
     print(f"\nWriting to Google Sheet: {args.sheet_id}")
@@ -127,7 +204,7 @@ def main():
         sys.exit(1)
     
     try:
-        writer.append_category_totals(args.month, category_totals)
+        writer.append_many(month_items)
         print("Successfully appended category totals to Google Sheet!")
     except Exception as e:
         print(f"Error writing to Google Sheet: {e}")
@@ -3,11 +3,86 @@ Google Sheets writer.
 
 Appends category totals to a Google Sheet.
 """
-import gspread
-from google.oauth2.service_account import Credentials
-from typing import Dict
-import yaml
+import atexit
+import json
 import os
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; cache is used unlocked
+    fcntl = None
+
+
+# Google Sheets REST API endpoint for spreadsheets
+SHEETS_API_URL = 'https://sheets.googleapis.com/v4/spreadsheets'
+
+# A1 ranges without a sheet name refer to the first sheet
+APPEND_RANGE = 'A:C'
+
+# Parsed service-account keys by credentials file path, shared by all
+# SheetsWriter instances in the process
+_KEY_CACHE: Dict[str, dict] = {}
+
+# Access tokens are reused across runs until they expire
+TOKEN_CACHE_FILE = os.path.join(
+    os.path.expanduser('~'), '.cache', 'credit-card-statements', 'token.json'
+)
+
+
+def _credentials_key(credentials_file: str) -> Dict[str, object]:
+    """Identify a credentials file by path and mtime, so a replaced key invalidates the cache."""
+    return {
+        'credentials_file': os.path.abspath(credentials_file),
+        'mtime': os.path.getmtime(credentials_file),
+    }
+
+
+def _load_cached_token(credentials_file: str) -> Optional[Dict[str, str]]:
+    """
+    Read the cached access token for a credentials file.
+    
+    Returns:
+        Dict with 'token' and 'expiry' (ISO format, UTC), or None if there
+        is no usable cache entry
+    """
+    try:
+        with open(TOKEN_CACHE_FILE, 'r') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_SH)
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    key = _credentials_key(credentials_file)
+    if any(cached.get(name) != value for name, value in key.items()):
+        return None
+    if not cached.get('token') or not cached.get('expiry'):
+        return None
+    return cached
+
+
+def _save_token(credentials_file: str, creds):
+    """Write the current access token of creds to the cache file."""
+    if not creds.token or creds.expiry is None:
+        return
+    
+    cached = _credentials_key(credentials_file)
+    cached['token'] = creds.token
+    cached['expiry'] = creds.expiry.isoformat()
+    
+    try:
+        os.makedirs(os.path.dirname(TOKEN_CACHE_FILE), exist_ok=True)
+        # The token grants sheet access, so keep the file private
+        fd = os.open(TOKEN_CACHE_FILE, os.O_WRONLY | os.O_CREAT, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            f.truncate()
+            json.dump(cached, f)
+    except OSError:
+        pass  # caching is best-effort
 
 
 class SheetsWriter:
@@ -23,53 +98,97 @@ class SheetsWriter:
         """
         self.credentials_file = credentials_file
         self.sheet_id = sheet_id
-        self.client = None
-        self.sheet = None
+        self.session = None
     
     def _connect(self):
-        """Connect to Google Sheets using service account."""
-        if self.client is None:
+        """Create an authorized HTTP session using the service account."""
+        if self.session is None:
+            # Imported here so the CLI starts (and --help returns) without
+            # loading the Google auth stack
+            from google.auth.transport.requests import AuthorizedSession, Request
+            from google.oauth2.service_account import Credentials
+            
             scope = [
                 'https://spreadsheets.google.com/feeds',
                 'https://www.googleapis.com/auth/drive'
             ]
-            creds = Credentials.from_service_account_file(
-                self.credentials_file,
-                scopes=scope
-            )
-            self.client = gspread.authorize(creds)
-            self.sheet = self.client.open_by_key(self.sheet_id).sheet1
+            info = _KEY_CACHE.get(self.credentials_file)
+            if info is None:
+                with open(self.credentials_file, 'r') as f:
+                    info = _KEY_CACHE[self.credentials_file] = json.load(f)
+            creds = Credentials.from_service_account_info(info, scopes=scope)
+            
+            # Reuse the previous run's access token when it is still valid,
+            # and only do the OAuth token exchange otherwise
+            cached = _load_cached_token(self.credentials_file)
+            if cached:
+                creds.token = cached['token']
+                creds.expiry = datetime.fromisoformat(cached['expiry'])
+            if not creds.valid:
+                creds.refresh(Request())
+            
+            # The session may refresh the token again, so save it on exit
+            atexit.register(_save_token, self.credentials_file, creds)
+            self.session = AuthorizedSession(creds)
     
-    def append_category_totals(self, month: str, category_totals: Dict[str, float]):
+    def _values_url(self, a1_range: str) -> str:
+        """Build the values endpoint URL for a range of this sheet."""
+        return f'{SHEETS_API_URL}/{self.sheet_id}/values/{a1_range}'
+    
+    def append_category_totals(self, month: str, category_totals: Iterable[Tuple[str, float]]):
         """
         Append category totals to the sheet.
         
         Args:
             month: Month string (e.g., "December 2025")
-            category_totals: Dictionary mapping category names to amounts
+            category_totals: (category, amount) pairs, already in row order
+        """
+        self.append_many({month: category_totals})
+    
+    def append_many(self, month_to_totals: Dict[str, Iterable[Tuple[str, float]]]):
+        """
+        Append category totals for several months to the sheet.
+        
+        Args:
+            month_to_totals: Month string -> (category, amount) pairs, already
+                in row order; months are written in dictionary order
         """
         self._connect()
         
-        # Prepare rows: one per category
-        rows = []
-        for category, amount in sorted(category_totals.items()):
-            rows.append([month, category, amount])
+        # Prepare rows: one per month and category
+        rows = [[month, category, amount]
+                for month, category_totals in month_to_totals.items()
+                for category, amount in category_totals]
         
-        # Append all rows at once
+        # Append all rows at once, in a single values.append request
+        # (values.batchUpdate writes to fixed ranges, it cannot append)
+        # (RAW, so month strings are not reinterpreted as dates)
         if rows:
-            self.sheet.append_rows(rows)
+            response = self.session.post(
+                self._values_url(APPEND_RANGE) + ':append',
+                params={'valueInputOption': 'RAW'},
+                json={'values': rows}
+            )
+            response.raise_for_status()
     
     def validate_connection(self) -> bool:
         """
-        Validate that we can connect to the sheet.
+        Validate that the service account can open the sheet.
+        
+        Only the spreadsheet ID is requested, so this is a cheap probe that
+        catches a wrong sheet ID or a sheet not shared with the service
+        account before anything is appended.
         
         Returns:
             True if connection successful
         """
         try:
             self._connect()
-            # Try to read first row to verify access
-            self.sheet.row_values(1)
+            response = self.session.get(
+                f'{SHEETS_API_URL}/{self.sheet_id}',
+                params={'fields': 'spreadsheetId'}
+            )
+            response.raise_for_status()
             return True
         except Exception as e:
             print(f"Error connecting to Google Sheet: {e}")
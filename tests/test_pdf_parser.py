@@ -0,0 +1,170 @@
+"""
+Tests for statement text extraction (PDFParser._extract_transactions_from_text)
+and the text extraction backends.
+"""
+import os
+import subprocess
+from datetime import datetime
+
+import pytest
+
+from parser import pdf_parser as pdf_parser_module
+from parser.pdf_parser import PDFParser, Transaction
+
+
+FIXTURE_PDF = os.path.join(os.path.dirname(__file__), 'fixtures', 'statement.pdf')
+
+
+@pytest.fixture
+def parser():
+    """Parser with a fixed reference date, so year inference is stable."""
+    pdf_parser = PDFParser('statement.pdf', backend='pymupdf')
+    pdf_parser._set_now(datetime(2026, 1, 20))
+    return pdf_parser
+
+
+def test_double_date_uses_transaction_date(parser):
+    rows = parser._extract_transactions_from_text(
+        "NOV 25 NOV 27 MCDONALD'S #40392 BRAMPTON ON $3.38"
+    )
+    assert rows == [("MCDONALD'S #40392 BRAMPTON ON", datetime(2025, 11, 27), 3.38)]
+
+
+def test_single_date(parser):
+    rows = parser._extract_transactions_from_text("DEC 05 STARBUCKS COFFEE   TORONTO $7.25")
+    assert rows == [('STARBUCKS COFFEE TORONTO', datetime(2025, 12, 5), 7.25)]
+
+
+def test_current_year_and_indented_line(parser):
+    # pdftotext -layout indents rows; months up to the current one are this year
+    rows = parser._extract_transactions_from_text("   JAN 02 JAN 03 TIM HORTONS #123   $4.00  ")
+    assert rows == [('TIM HORTONS #123', datetime(2026, 1, 3), 4.0)]
+
+
+def test_reference_numbers_are_stripped(parser):
+    text = (
+        "NOV 26 NOV 28 PRESTO FARE/ABC123 TORONTO ON 74064495330012345678901 $12.00\n"
+        "DEC 03 DEC 04 WAL-MART SUPERCENTER#1234 12-345 $1,234.56"
+    )
+    rows = parser._extract_transactions_from_text(text)
+    assert rows == [
+        ('PRESTO FARE/ABC123 TORONTO ON', datetime(2025, 11, 28), 12.0),
+        ('WAL-MART SUPERCENTER#1234', datetime(2025, 12, 4), 1234.56),
+    ]
+
+
+@pytest.mark.parametrize('line', [
+    'TRANSACTION POSTING ACTIVITY DESCRIPTION AMOUNT ($)',
+    'MINIMUM PAYMENT DUE DATE JAN 15, 2026 $10.00',
+    'NEW BALANCE DEC 19 $55.00',
+    'Previous Balance $1,000.00',
+    'STATEMENT FROM NOV 20 TO DEC 19 $0.00',
+])
+def test_header_and_summary_lines_are_skipped(parser, line):
+    assert parser._extract_transactions_from_text(line) == []
+
+
+def test_invalid_lines_are_skipped(parser):
+    text = (
+        "FEB 30 FEB 31 IMPOSSIBLE DATE $1.00\n"    # no such day
+        "NOV 25 NOV 27 X $4.00\n"                  # merchant too short
+        "NOV 25 NOV 27 NO AMOUNT ON THIS LINE\n"   # amount on the next line
+        "$3.38\n"
+        "NOV 25 NOV 27 FREE ITEM $0.00"            # not a purchase
+    )
+    assert parser._extract_transactions_from_text(text) == []
+
+
+def test_page_keeps_line_order(parser):
+    text = (
+        "TRANSACTION POSTING ACTIVITY DESCRIPTION AMOUNT ($)\n"
+        "DATE DATE\n"
+        "OCT 9 OCT 10 SPOTIFY P1234 STOCKHOLM $11.99\n"
+        "MINIMUM PAYMENT DUE DATE JAN 15, 2026 $10.00\n"
+        "SEP 30 OCT 01 UBER EATS   HELP.UBER.COM $25.10\n"
+    )
+    rows = parser._extract_transactions_from_text(text)
+    assert rows == [
+        ('SPOTIFY P1234 STOCKHOLM', datetime(2025, 10, 10), 11.99),
+        ('UBER EATS HELP.UBER.COM', datetime(2025, 10, 1), 25.1),
+    ]
+
+
+def test_auto_backend_does_not_depend_on_path(monkeypatch):
+    monkeypatch.setattr(pdf_parser_module, '_have_pdftotext', lambda: True)
+    assert PDFParser('statement.pdf').backend == 'pymupdf'
+
+
+def test_pdftotext_layout_columns_are_split(parser, monkeypatch):
+    # -layout puts the summary sidebar on the same line as a transaction
+    layout = (
+        "   NOV 25   NOV 27   MCDONALD'S #40392 BRAMPTON ON      $3.38        NEW BALANCE $55.00\n"
+        "   DEC 03   DEC 04   WAL-MART SUPERCENTER#1234      $1,234.56\f"
+        "   DEC 05   DEC 06   STARBUCKS COFFEE TORONTO           $7.25\n"
+    )
+    calls = []
+    
+    def fake_run(args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, layout.encode(), b'')
+    
+    monkeypatch.setattr(pdf_parser_module.subprocess, 'run', fake_run)
+    
+    rows = parser._parse_with_pdftotext()
+    assert calls == [['pdftotext', '-layout', '--', 'statement.pdf', '-']]
+    assert rows == [
+        ("MCDONALD'S #40392 BRAMPTON ON", datetime(2025, 11, 27), 3.38),
+        ('WAL-MART SUPERCENTER#1234', datetime(2025, 12, 4), 1234.56),
+        ('STARBUCKS COFFEE TORONTO', datetime(2025, 12, 6), 7.25),
+    ]
+
+
+def test_pdftotext_failure_reports_stderr(parser, monkeypatch):
+    def fake_run(args, **kwargs):
+        return subprocess.CompletedProcess(args, 1, b'', b"Syntax Error: Couldn't find trailer dictionary\n")
+    
+    monkeypatch.setattr(pdf_parser_module.subprocess, 'run', fake_run)
+    
+    with pytest.raises(ValueError, match="Couldn't find trailer dictionary"):
+        parser._parse_with_pdftotext()
+
+
+def _fixture_rows(backend):
+    pdf_parser = PDFParser(FIXTURE_PDF, backend=backend)
+    pdf_parser._set_now(datetime(2026, 1, 20))
+    pdf_parser.extract()
+    return list(zip(pdf_parser.merchants, pdf_parser.dates, pdf_parser.amounts))
+
+
+def test_pymupdf_backend_on_fixture():
+    pytest.importorskip('pymupdf')
+    assert _fixture_rows('pymupdf') == [
+        ("MCDONALD'S #40392 BRAMPTON ON", datetime(2025, 11, 27), 3.38),
+        ('PRESTO FARE/ABC123 TORONTO ON', datetime(2025, 11, 28), 12.0),
+        ('WAL-MART SUPERCENTER#1234', datetime(2025, 12, 4), 1234.56),
+        ('STARBUCKS COFFEE TORONTO', datetime(2025, 12, 6), 7.25),
+        ('UBER EATS HELP.UBER.COM', datetime(2025, 12, 9), 25.1),
+    ]
+
+
+def test_pdftotext_matches_pymupdf_on_fixture():
+    pytest.importorskip('pymupdf')
+    if not pdf_parser_module._have_pdftotext():
+        pytest.skip('pdftotext is not installed')
+    assert _fixture_rows('pdftotext') == _fixture_rows('pymupdf')
+
+
+def test_parse_returns_transactions(monkeypatch):
+    rows = [
+        ("MCDONALD'S #40392 BRAMPTON ON", datetime(2025, 11, 27), 3.38),
+        ('STARBUCKS COFFEE TORONTO', datetime(2025, 12, 6), 7.25),
+    ]
+    monkeypatch.setattr(PDFParser, '_parse_with_pymupdf', lambda self, debug=False: rows)
+    
+    pdf_parser = PDFParser('statement.pdf', backend='pymupdf')
+    transactions = pdf_parser.parse()
+    
+    assert all(isinstance(transaction, Transaction) for transaction in transactions)
+    assert [(t.merchant_description, t.transaction_date, t.amount) for t in transactions] == rows
+    assert transactions is pdf_parser.transactions
+    assert pdf_parser.amounts == [3.38, 7.25]
@@ -0,0 +1,86 @@
+"""
+Tests for the pattern rules (classifier.rules) and their precedence in
+classify_transaction.
+"""
+from datetime import datetime
+
+import pytest
+
+from classifier.classify import CATEGORY_IDS, SKIPPED, classify_transaction
+from classifier.rules import (
+    FOOD, IGNORE, NOT_FOOD, OVERRIDE, classify_by_patterns, get_hard_override, should_ignore
+)
+
+
+MONDAY = datetime(2025, 12, 1)
+SATURDAY = datetime(2025, 12, 6)
+
+
+@pytest.mark.parametrize('merchant', [
+    'STARBUCKS COFFEE TORONTO',
+    'TIM HORTONS COFFEE #123',
+    'COFFEE CULTURE BRAMPTON',
+])
+def test_fee_inside_coffee_does_not_skip_food(merchant):
+    assert not should_ignore(merchant)
+    assert classify_by_patterns(merchant) == (FOOD, None)
+    assert classify_transaction(merchant, MONDAY, 4.50) == CATEGORY_IDS['school meals']
+    assert classify_transaction(merchant, SATURDAY, 4.50) == CATEGORY_IDS['food']
+
+
+@pytest.mark.parametrize('merchant', [
+    'ANNUAL FEE',
+    'OVERLIMIT FEES',
+    'PURCHASE INTEREST',
+    'PAYMENT - THANK YOU / PAIEMENT - MERCI',
+])
+def test_ignored_merchants(merchant):
+    assert should_ignore(merchant)
+    assert classify_transaction(merchant, MONDAY, 25.00) == SKIPPED
+
+
+def test_ignore_beats_override():
+    merchant = 'PRESTO AUTOLOAD PAYMENT'
+    assert get_hard_override(merchant) == 'presto'
+    assert classify_by_patterns(merchant) == (IGNORE, None)
+    assert classify_transaction(merchant, MONDAY, 20.00) == SKIPPED
+
+
+def test_override_beats_food():
+    # SUB (from SUBSCR) is a food keyword
+    merchant = 'OPENAI *CHATGPT SUBSCR'
+    assert classify_by_patterns(merchant) == (OVERRIDE, 'personal')
+    assert classify_transaction(merchant, MONDAY, 28.25) == CATEGORY_IDS['personal']
+
+
+def test_override_beats_not_food():
+    # WAL-MART and SUPERCENTER are also food exclusions
+    merchant = 'WAL-MART SUPERCENTER#1234'
+    assert classify_by_patterns(merchant) == (OVERRIDE, 'groceries')
+    assert classify_transaction(merchant, SATURDAY, 1234.56) == CATEGORY_IDS['groceries']
+
+
+def test_not_food_beats_food():
+    merchant = 'LOBLAWS CAFE'
+    assert classify_by_patterns(merchant) == (NOT_FOOD, None)
+    # Not food, so the amount fallback decides
+    assert classify_transaction(merchant, MONDAY, 8.00) == CATEGORY_IDS['groceries']
+
+
+def test_first_listed_override_wins():
+    # Both WAL-MART and SHOPPERS are overrides; the earlier one is used
+    assert get_hard_override('SHOPPERS AT WAL-MART') == 'groceries'
+    assert get_hard_override('CITY OF TORONTO PRESTO') == 'presto'
+
+
+@pytest.mark.parametrize('merchant, amount, category', [
+    ("MCDONALD'S #40392 BRAMPTON ON", 3.38, 'school meals'),
+    ('UBER EATS HELP.UBER.COM', 25.10, 'school meals'),
+    ('PRESTO FARE/ABC123 TORONTO ON', 12.00, 'presto'),
+    ('SHOPPERS DRUG MART #123', 15.00, 'groceries'),
+    ('SPOTIFY P1234 STOCKHOLM', 11.99, 'other'),
+    ('CITY OF TORONTO PARKING', 6.00, 'other'),
+    ('BEST BUY #123 MISSISSAUGA ON', 349.99, 'school'),
+])
+def test_real_merchant_strings(merchant, amount, category):
+    assert classify_transaction(merchant, MONDAY, amount) == CATEGORY_IDS[category]